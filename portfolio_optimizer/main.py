@@ -26,6 +26,9 @@ import numpy as np
 import time
 from DateAxisItem import DateAxisItem
 
+PICK_RADIUS_PIXELS = 8
+PICK_CANDIDATES = 16
+
 class PandasModel(QtCore.QAbstractTableModel):
     def __init__(self, df=pd.DataFrame(), parent=None):
         QtCore.QAbstractTableModel.__init__(self, parent=parent)
@@ -65,6 +68,11 @@ class Window(QMainWindow):
         super().__init__()
         self._data_file_name = ""
         self._data = pd.DataFrame()
+        self._weights = None
+        self._weightColumns = None
+        self._portfolioIndex = None
+        self._selectedPortfolioIndex = None
+        self._selectedPortfolioPlot = None
         self.initUI()
 
     def initUI(self):
@@ -103,6 +111,7 @@ class Window(QMainWindow):
         randomMinVolatilityLayout, self.randomMinVolatilityLabel = self.createParameterLayout("Min Volatility (from random portfolio): ")
         optimizedMaxSharpeRatioLayout, self.optimizedMaxSharpeRatioLabel = self.createParameterLayout("Max Sharpe Ratio (optimized): ")
         optimizedMinVolatilityLayout, self.optimizedMinVolatilityLabel = self.createParameterLayout("Min Volatility (optimized): ")
+        selectedPortfolioLayout, self.selectedPortfolioLabel = self.createParameterLayout("Selected portfolio: ")
         
 
         self.sharpeChartView = QChartView(self.createChart([], [], "Max Sharpe Ratio Potfolio Allocation"))
@@ -111,6 +120,12 @@ class Window(QMainWindow):
         self.volatilityChartView = QChartView(self.createChart([], [], "Minimum Volatility Potfolio Allocation"))
         self.volatilityChartView.setRenderHint(QtGui.QPainter.Antialiasing)
 
+        selectedChart = self.createChart([], [], "Selected Potfolio Allocation")
+        selectedChart.setAnimationOptions(QChart.NoAnimation)
+        self._selectedPieSeries = selectedChart.series()[0]
+        self.selectedChartView = QChartView(selectedChart)
+        self.selectedChartView.setRenderHint(QtGui.QPainter.Antialiasing)
+
         
         optionsLayout.addLayout(riskRateLayout)
         optionsLayout.addLayout(portfolioNumLayout)
@@ -121,6 +136,8 @@ class Window(QMainWindow):
         optionsLayout.addLayout(randomMinVolatilityLayout)
         optionsLayout.addLayout(optimizedMinVolatilityLayout)
         optionsLayout.addWidget(self.volatilityChartView)
+        optionsLayout.addLayout(selectedPortfolioLayout)
+        optionsLayout.addWidget(self.selectedChartView)
 
         tabs = QTabWidget()
         self.tableView = QTableView()
@@ -137,6 +154,8 @@ class Window(QMainWindow):
         mptWidget = QWidget()
         mptLayout = QHBoxLayout()
         self._mptPlot = self.createPlot("Efficient Frontier", "Annualized Volatility", "Annualized Returns")
+        self._mptMouseProxy = pg.SignalProxy(self._mptPlot.scene().sigMouseMoved, rateLimit=30,
+                                             slot=self.onMptPlotMouseMoved)
         mptLayout.addWidget(self._mptPlot, 50)
         mptLayout.addLayout(optionsLayout, 50)
         mptWidget.setLayout(mptLayout)
@@ -212,6 +231,12 @@ class Window(QMainWindow):
             self.showStockData()
             self.plotStocksData()
             self.plotDailyReturn()
+            self._weights = None
+            self._weightColumns = None
+            self._portfolioIndex = None
+            self._mptPlot.clear()
+            self._selectedPortfolioPlot = None
+            self.resetSelectedPortfolio()
 
     def onGenerateButtonClick(self):
         risk_rate = float(self.riskRateLineEdit.text())
@@ -268,6 +293,11 @@ class Window(QMainWindow):
                                     "Minimum Volatility Potfolio Allocation")
         self.volatilityChartView.setChart(newVolatilityChart)
 
+        self._weights = weights
+        self._weightColumns = self._data.columns.values
+        self._portfolioIndex = portfolio.build_portfolio_index(volatilities, returns)
+        self.resetSelectedPortfolio()
+
         self.plotBullet(volatilities,
                         returns,
                         random_min_volatility_point,
@@ -276,6 +306,58 @@ class Window(QMainWindow):
                         (sharpe_vol, sharpe_ret),
                         (frontier_x, frontier_y))
 
+    def resetSelectedPortfolio(self):
+        self._selectedPortfolioIndex = None
+        self.selectedPortfolioLabel.setText("")
+        self._selectedPieSeries.clear()
+        if self._selectedPortfolioPlot is not None:
+            self._selectedPortfolioPlot.setData([], [])
+
+    def selectPortfolio(self, index, volatility, ret):
+        self._selectedPortfolioIndex = index
+        self.selectedPortfolioLabel.setText("return - " + str(round(ret, 2)) + ", volatility - " + str(round(volatility, 2)))
+        self._selectedPortfolioPlot.setData([volatility], [ret])
+
+        values = np.round(self._weights[index] * 100, 2).tolist()
+        if self._selectedPieSeries.count() != len(values):
+            self._selectedPieSeries.clear()
+            for name, value in zip(self._weightColumns, values):
+                self._selectedPieSeries.append(name + " " + str(value) + "%", value)
+            return
+        for pieSlice, name, value in zip(self._selectedPieSeries.slices(), self._weightColumns, values):
+            pieSlice.setValue(value)
+            pieSlice.setLabel(name + " " + str(value) + "%")
+
+    def onMptPlotMouseMoved(self, event):
+        if self._portfolioIndex is None or self._selectedPortfolioPlot is None:
+            return
+        position = event[0]
+        if not self._mptPlot.sceneBoundingRect().contains(position):
+            return
+        viewBox = self._mptPlot.getPlotItem().vb
+        point = viewBox.mapSceneToView(position)
+        pixelWidth, pixelHeight = viewBox.viewPixelSize()
+        candidates = portfolio.find_nearest_portfolios(self._portfolioIndex, point.x(), point.y(), PICK_CANDIDATES,
+                                                       (PICK_RADIUS_PIXELS * pixelWidth, PICK_RADIUS_PIXELS * pixelHeight))
+
+        tree, scale = self._portfolioIndex
+        best_index, best_distance = None, PICK_RADIUS_PIXELS
+        for index in candidates:
+            candidate_x, candidate_y = tree.data[index] * scale
+            candidate_position = viewBox.mapViewToScene(QtCore.QPointF(candidate_x, candidate_y))
+            distance = np.hypot(candidate_position.x() - position.x(), candidate_position.y() - position.y())
+            if distance <= best_distance:
+                best_index, best_distance = index, distance
+
+        if best_index is None:
+            if self._selectedPortfolioIndex is not None:
+                self.resetSelectedPortfolio()
+            return
+        if best_index == self._selectedPortfolioIndex:
+            return
+        selected_x, selected_y = tree.data[best_index] * scale
+        self.selectPortfolio(best_index, selected_x, selected_y)
+
     def showStockData(self):
         model = PandasModel(self._data)
         self.tableView.setModel(model)
@@ -319,6 +401,10 @@ class Window(QMainWindow):
                           name="Max Sharpe Ratio (from random generated)", pen=None, symbol='star', symbolPen=pg.mkPen(color=(0, 0, 0, 255), width=2),
                           symbolBrush=pg.mkBrush(color=(0, 255, 0, 255)), symbolSize=20)
 
+        self._selectedPortfolioPlot = self._mptPlot.plot([], [], pen=None, symbol='o',
+                                                         symbolPen=pg.mkPen(color=(0, 0, 0, 255), width=2),
+                                                         symbolBrush=pg.mkBrush(color=(255, 255, 0, 255)), symbolSize=12)
+
 
 def main():
     app = QApplication(sys.argv)
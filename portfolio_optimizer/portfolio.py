@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import scipy.optimize as sco
+import scipy.spatial as scs
 
 DAYS = 252
 
@@ -98,6 +99,63 @@ def calculate_efficient_frontier(mean_returns, cov_matrix, returns_range):
     return efficients
 
 
+def build_portfolio_index(volatilities, returns):
+    points = np.column_stack((volatilities, returns))
+    scale = np.ptp(points, axis=0)
+    scale[scale == 0] = 1.0
+    return scs.cKDTree(points / scale), scale
+
+
+def find_nearest_portfolios(portfolio_index, volatility, ret, count, radius):
+    tree, scale = portfolio_index
+    distances, indexes = tree.query(np.array([volatility, ret]) / scale, k=count,
+                                    distance_upper_bound=np.max(np.asarray(radius) / scale))
+    return indexes[np.isfinite(distances)]
+
+
+# Equity curves are shaped (days, weights, periods, costs) and start from 1 on data.index[0];
+# turnovers and max drawdowns are shaped (weights, periods, costs).
+# Costs are charged as a fraction of the traded value, including the initial purchase on day 0.
+# Turnover is one-way (half the sum of absolute weight changes) per rebalance, annualized,
+# and excludes the initial purchase.
+def simulate_rebalancing(data, weights, rebalance_periods, transaction_costs):
+    prices = data.to_numpy(dtype=float)
+    if len(prices) < 2:
+        raise ValueError("At least two days of prices are required, got " + str(len(prices)))
+    rebalance_periods = np.atleast_1d(rebalance_periods)
+    if np.any(rebalance_periods < 1) or np.any(rebalance_periods % 1 != 0):
+        raise ValueError("Rebalance periods must be positive whole numbers of days, got " + str(rebalance_periods.tolist()))
+    rebalance_periods = rebalance_periods.astype(int)
+    weights = np.atleast_2d(weights)
+    costs = np.atleast_1d(np.asarray(transaction_costs, dtype=float))
+    num_days = len(prices)
+    days = np.arange(num_days)
+    years = (num_days - 1) / DAYS
+
+    equity_curves = np.zeros((num_days, len(weights), len(rebalance_periods), len(costs)))
+    turnovers = np.zeros((len(weights), len(rebalance_periods), len(costs)))
+    for j, period in enumerate(rebalance_periods):
+        blocks = days // period
+        drift_growth = np.dot(prices / prices[blocks * period], weights.T)
+
+        rebalance_days = np.arange(period, num_days, period)
+        period_growth = prices[rebalance_days] / prices[rebalance_days - period]
+        drifted_weights = period_growth[:, np.newaxis, :] * weights
+        block_growth = drifted_weights.sum(axis=2)
+        drifted_weights /= block_growth[:, :, np.newaxis]
+        traded = np.abs(drifted_weights - weights).sum(axis=2)
+        turnover = traded / 2
+
+        rebalanced_values = np.cumprod(block_growth[:, :, np.newaxis] * (1 - traded[:, :, np.newaxis] * costs), axis=0)
+        rebalanced_values = np.concatenate((np.ones((1, len(weights), len(costs))), rebalanced_values)) * (1 - costs)
+
+        equity_curves[:, :, j, :] = rebalanced_values[blocks] * drift_growth[:, :, np.newaxis]
+        turnovers[:, j, :] = turnover.sum(axis=0)[:, np.newaxis] / years
+
+    max_drawdowns = np.max(1 - equity_curves / np.maximum.accumulate(equity_curves, axis=0), axis=0)
+    return equity_curves, turnovers, max_drawdowns
+
+
 def get_data(path):
     df = pd.read_csv(path, index_col=0)
     return df